@@ -14,24 +14,72 @@
 # 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 """arXiv paper fetcher for recent submissions."""
 
+import asyncio
 import re
-from dataclasses import dataclass
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
+import aiohttp
 import arxiv
 import feedparser
+import requests
 
+from .bloom import BloomFilter
+from .rate_limiter import RateLimiter
 
-@dataclass
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+HTTP_CACHE_FILE = DATA_DIR / "http_cache.sqlite"
+HTTP_CACHE_TTL = timedelta(days=15)
+SEEN_FILE = DATA_DIR / "seen.bloom"
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+API_CHUNK_SIZE = 100
+API_NUM_RETRIES = 3
+API_RETRY_DELAY = 3.0
+
+# arXiv asks for at most one request every 3 seconds; the small burst lets
+# the per-category RSS feeds go out together
+ARXIV_RATE_LIMITER = RateLimiter(rate=1 / 3.1, burst=3)
+
+# Shared clients keep HTTP connections alive across calls. The page size is
+# the largest the API serves, so a day of listings fits in one request.
+ARXIV_CLIENT = arxiv.Client(page_size=2000, delay_seconds=3.0, num_retries=3)
+# requests does not promise Session is thread-safe. The RSS workers share it
+# only for plain GETs with per-request headers, and never mutate its state
+# (headers, cookies, adapters); the underlying urllib3 pool is thread-safe.
+HTTP_SESSION = requests.Session()
+
+_ARXIV_ID_RE = re.compile(r'(\d{4}\.\d{4,5})(v\d+)?')
+_VSUFFIX_RE = re.compile(r'v\d+$')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@dataclass(slots=True, frozen=True)
 class Paper:
-    """Container for arXiv paper metadata."""
+    """Container for arXiv paper metadata, hashable for deduplication."""
     arxiv_id: str
     title: str
     abstract: str
-    authors: list[str]
-    categories: list[str]
+    authors: tuple[str, ...]
+    categories: tuple[str, ...]
     published: datetime
     url: str
+    # Lowercased title and abstract, computed once per paper for ranking
+    title_lc: str = field(init=False, repr=False, compare=False)
+    abstract_lc: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Frozen dataclass, so derived fields are set via object.__setattr__
+        object.__setattr__(self, "authors", tuple(self.authors))
+        object.__setattr__(self, "categories", tuple(self.categories))
+        object.__setattr__(self, "title_lc", self.title.lower())
+        object.__setattr__(self, "abstract_lc", self.abstract.lower())
 
     def __str__(self):
         authors_str = ", ".join(self.authors[:3])
@@ -41,31 +89,50 @@ class Paper:
                 f"{self.arxiv_id} | {self.published.date()}")
 
 
+def mark_seen(papers):
+    """
+    Record papers in the on-disk seen-ID filter used by `skip_seen`.
+
+    Call once the papers have actually been shown, since the filter cannot
+    forget IDs again.
+    """
+    seen = BloomFilter(filename=SEEN_FILE)
+    for paper in papers:
+        seen.add(_VSUFFIX_RE.sub('', paper.arxiv_id))
+    seen.save()
+
+
 def fetch_recent_papers(
     categories=("astro-ph.CO", "astro-ph.GA", "astro-ph.IM"),
     days=3,
+    skip_seen=False,
 ):
     """
     Fetch recent arXiv papers from specified categories.
 
+    Walks the API listing by submission date, so it is meant for multi-day
+    back-fills; today's announcement is served by `fetch_new_papers`.
+
     Parameters
     ----------
     categories : tuple of str
         arXiv category identifiers to search.
     days : int
         Number of days to look back.
+    skip_seen : bool
+        If True, skip papers recorded with `mark_seen`.
 
     Returns
     -------
     list of Paper
         Deduplicated papers sorted by publication date (newest first).
     """
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    # Compare POSIX timestamps to avoid aware-datetime comparisons per result
+    cutoff_ts = (datetime.now(timezone.utc) - timedelta(days=days)).timestamp()
     seen_ids = set()
     papers = []
     categories_set = set(categories)
-
-    client = arxiv.Client()
+    seen = BloomFilter(filename=SEEN_FILE) if skip_seen else None
 
     # Build OR query for all categories to catch cross-lists
     query = " OR ".join(f"cat:{cat}" for cat in categories)
@@ -75,8 +142,9 @@ def fetch_recent_papers(
         sort_order=arxiv.SortOrder.Descending,
     )
 
-    for result in client.results(search):
-        if result.published < cutoff:
+    for result in ARXIV_CLIENT.results(search):
+        # Results are sorted newest first, so stop at the first older one
+        if result.published.timestamp() < cutoff_ts:
             break
 
         # Check if paper has any of our target categories
@@ -87,6 +155,8 @@ def fetch_recent_papers(
         if arxiv_id in seen_ids:
             continue
         seen_ids.add(arxiv_id)
+        if seen is not None and _VSUFFIX_RE.sub('', arxiv_id) in seen:
+            continue
 
         paper = Paper(
             arxiv_id=arxiv_id,
@@ -104,7 +174,117 @@ def fetch_recent_papers(
     return papers
 
 
-def fetch_new_papers(categories=("astro-ph.CO", "astro-ph.GA", "astro-ph.IM")):
+def _open_http_cache():
+    """Open the feed cache database, dropping entries older than the TTL."""
+    DATA_DIR.mkdir(exist_ok=True)
+    conn = sqlite3.connect(HTTP_CACHE_FILE, timeout=30)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS feeds (url TEXT PRIMARY KEY, body BLOB, "
+        "last_modified TEXT, etag TEXT, fetched REAL)"
+    )
+    conn.execute("DELETE FROM feeds WHERE fetched < ?",
+                 (time.time() - HTTP_CACHE_TTL.total_seconds(),))
+    conn.commit()
+    return conn
+
+
+def _fetch_rss(cat):
+    """
+    Fetch the RSS feed entries of a single arXiv category.
+
+    Uses a conditional GET against the on-disk cache, so an unchanged feed
+    costs a header-only 304 response instead of the full XML body. If the
+    request fails, falls back to the cached body, or no entries without one.
+    """
+    feed_url = f"https://rss.arxiv.org/rss/{cat}"
+
+    with closing(_open_http_cache()) as conn:
+        cached = conn.execute(
+            "SELECT body, last_modified, etag FROM feeds WHERE url = ?",
+            (feed_url,),
+        ).fetchone()
+
+        headers = {}
+        if cached is not None:
+            if cached[1]:
+                headers["If-Modified-Since"] = cached[1]
+            if cached[2]:
+                headers["If-None-Match"] = cached[2]
+
+        ARXIV_RATE_LIMITER.wait()
+        try:
+            response = HTTP_SESSION.get(feed_url, headers=headers, timeout=60)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            # Don't let one failing category abort the whole fetch
+            if cached is None:
+                print(f"Warning: could not fetch {feed_url}: {e}")
+                return []
+            print(f"Warning: could not fetch {feed_url}, "
+                  f"using cached feed: {e}")
+            return feedparser.parse(cached[0]).entries
+
+        if response.status_code == 304 and cached is not None:
+            body = cached[0]
+            conn.execute("UPDATE feeds SET fetched = ? WHERE url = ?",
+                         (time.time(), feed_url))
+        else:
+            body = response.content
+            conn.execute(
+                "INSERT OR REPLACE INTO feeds VALUES (?, ?, ?, ?, ?)",
+                (feed_url, body, response.headers.get("Last-Modified"),
+                 response.headers.get("ETag"), time.time()),
+            )
+        conn.commit()
+
+    return feedparser.parse(body).entries
+
+
+async def _fetch_chunk(session, semaphore, ids):
+    """
+    Fetch Atom API entries for a chunk of arXiv IDs.
+
+    Transient failures (429, 5xx, connection errors and timeouts) are
+    retried up to `API_NUM_RETRIES` times with a growing delay.
+    """
+    params = {"id_list": ",".join(ids), "max_results": str(len(ids))}
+    async with semaphore:
+        for attempt in range(API_NUM_RETRIES):
+            if attempt > 0:
+                await asyncio.sleep(API_RETRY_DELAY * attempt)
+            await ARXIV_RATE_LIMITER.acquire()
+            try:
+                async with session.get(ARXIV_API_URL, params=params) as resp:
+                    resp.raise_for_status()
+                    text = await resp.text()
+                return feedparser.parse(text).entries
+            except aiohttp.ClientResponseError as e:
+                if e.status != 429 and e.status < 500:
+                    raise
+                error = e
+                # The full error repeats the URL with every ID in the chunk
+                reason = f"HTTP {e.status} {e.message}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+                reason = type(e).__name__
+            print(f"Warning: arXiv API request failed "
+                  f"(attempt {attempt + 1}/{API_NUM_RETRIES}): {reason}")
+    raise error
+
+
+async def _fetch_all(id_chunks, max_concurrent=4):
+    """Fetch all ID chunks concurrently, bounded by `max_concurrent`."""
+    semaphore = asyncio.Semaphore(max_concurrent)
+    async with aiohttp.ClientSession() as session:
+        return await asyncio.gather(
+            *[_fetch_chunk(session, semaphore, ids) for ids in id_chunks]
+        )
+
+
+def fetch_new_papers(
+    categories=("astro-ph.CO", "astro-ph.GA", "astro-ph.IM"),
+    skip_seen=False,
+):
     """
     Fetch today's new arXiv papers from RSS feeds.
 
@@ -114,21 +294,23 @@ def fetch_new_papers(categories=("astro-ph.CO", "astro-ph.GA", "astro-ph.IM")):
     ----------
     categories : tuple of str
         arXiv category identifiers to fetch.
+    skip_seen : bool
+        If True, skip papers recorded with `mark_seen`.
 
     Returns
     -------
     list of Paper
         Papers from today's announcement, deduplicated.
     """
+    # Fetch RSS for all categories in parallel, network-bound
+    with ThreadPoolExecutor(max_workers=max(1, len(categories))) as executor:
+        feeds = list(executor.map(_fetch_rss, categories))
+
+    # Merge sequentially so deduplication stays deterministic
     seen_ids = set()
     all_ids = []
-
-    # Fetch RSS for each category
-    for cat in categories:
-        feed_url = f"https://rss.arxiv.org/rss/{cat}"
-        feed = feedparser.parse(feed_url)
-
-        for entry in feed.entries:
+    for entries in feeds:
+        for entry in entries:
             # Include new submissions and cross-lists, but not replacements
             announce_type = getattr(entry, 'arxiv_announce_type', '')
             if announce_type not in ('new', 'cross'):
@@ -136,40 +318,49 @@ def fetch_new_papers(categories=("astro-ph.CO", "astro-ph.GA", "astro-ph.IM")):
 
             # Extract arXiv ID from link
             # Link format: http://arxiv.org/abs/2512.22356v1
-            match = re.search(r'(\d{4}\.\d{4,5})(v\d+)?', entry.link)
+            match = _ARXIV_ID_RE.search(entry.link)
             if match:
                 arxiv_id = match.group(1)
                 if arxiv_id not in seen_ids:
                     seen_ids.add(arxiv_id)
                     all_ids.append(arxiv_id)
 
+    # Skip previously seen papers before requesting their metadata
+    seen = BloomFilter(filename=SEEN_FILE) if skip_seen else None
+    if seen is not None:
+        all_ids = [arxiv_id for arxiv_id in all_ids if arxiv_id not in seen]
+
     if not all_ids:
         return []
 
-    # Fetch full metadata via API
-    client = arxiv.Client()
-    search = arxiv.Search(id_list=all_ids)
+    # Fetch full metadata via API, chunked and concurrent
+    id_chunks = [all_ids[i:i + API_CHUNK_SIZE]
+                 for i in range(0, len(all_ids), API_CHUNK_SIZE)]
+    chunk_entries = asyncio.run(_fetch_all(id_chunks))
 
     papers = []
     categories_set = set(categories)
 
-    for result in client.results(search):
+    for entry in (e for entries in chunk_entries for e in entries):
+        entry_categories = [tag["term"] for tag in entry.get("tags", [])]
         # Check if paper has any of our target categories
-        if not categories_set.intersection(result.categories):
+        if not categories_set.intersection(entry_categories):
             continue
 
-        arxiv_id = result.entry_id.split("/")[-1]
+        arxiv_id = entry.id.split("/")[-1]
         # Remove version suffix for consistency
-        arxiv_id = re.sub(r'v\d+$', '', arxiv_id)
+        arxiv_id = _VSUFFIX_RE.sub('', arxiv_id)
 
         paper = Paper(
             arxiv_id=arxiv_id,
-            title=result.title.replace("\n", " "),
-            abstract=result.summary.replace("\n", " "),
-            authors=[a.name for a in result.authors],
-            categories=result.categories,
-            published=result.published,
-            url=result.entry_id,
+            # The Atom API wraps long fields over indented lines
+            title=_WHITESPACE_RE.sub(" ", entry.title).strip(),
+            abstract=_WHITESPACE_RE.sub(" ", entry.summary).strip(),
+            authors=[a.name for a in entry.get("authors", [])],
+            categories=entry_categories,
+            published=datetime(*entry.published_parsed[:6],
+                               tzinfo=timezone.utc),
+            url=entry.id,
         )
         papers.append(paper)
 
@@ -0,0 +1,75 @@
+# Copyright (C) 2025 Richard Stiskalek
+# This program is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 3 of the License, or (at your
+# option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Persistent Bloom filter for remembering previously seen arXiv IDs."""
+
+import hashlib
+import math
+from pathlib import Path
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter backed by a bit array, optionally on disk.
+
+    Membership tests may return false positives at roughly `error_rate`
+    once `capacity` keys have been added, but never false negatives.
+
+    Parameters
+    ----------
+    capacity : int
+        Expected number of keys.
+    error_rate : float
+        Target false positive probability at full capacity.
+    filename : str or Path, optional
+        File the bit array is loaded from and saved to.
+    """
+
+    def __init__(self, capacity=1_000_000, error_rate=0.001, filename=None):
+        self.n_bits = math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self.filename = Path(filename) if filename is not None else None
+
+        n_bytes = (self.n_bits + 7) // 8
+        if self.filename is not None and self.filename.exists():
+            data = self.filename.read_bytes()
+            # Start afresh if the file was written with other parameters
+            self._bits = (bytearray(data) if len(data) == n_bytes
+                          else bytearray(n_bytes))
+        else:
+            self._bits = bytearray(n_bytes)
+
+    def _positions(self, key):
+        """Bit positions of `key`, via double hashing of one digest."""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.n_hashes):
+            yield (h1 + i * h2) % self.n_bits
+
+    def __contains__(self, key):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7))
+                   for pos in self._positions(key))
+
+    def add(self, key):
+        """Add `key` to the filter."""
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def save(self):
+        """Write the bit array to `filename`."""
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        self.filename.write_bytes(self._bits)
@@ -14,22 +14,29 @@
 # 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 """Rank papers by keyword relevance with TF-IDF weighting."""
 
+import asyncio
 import hashlib
-import json
 import re
+from functools import lru_cache
 from pathlib import Path
 
+import ahocorasick
 import anthropic
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+import orjson
 
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 CACHE_FILE = DATA_DIR / "claude_cache.json"
+CLAUDE_CHUNK_SIZE = 10
+CLAUDE_MAX_CONCURRENT = 5
+
+_TOKEN_RE = re.compile(r'\b\w+\b')
 
 
 def compute_config_hash():
     """Compute hash of keywords and research description files."""
-    hasher = hashlib.md5()
+    hasher = hashlib.sha256()
     for filename in ["keywords.txt", "research_description.txt"]:
         path = DATA_DIR / filename
         if path.exists():
@@ -42,8 +49,7 @@ def load_cache():
     if not CACHE_FILE.exists():
         return {}
 
-    with open(CACHE_FILE) as f:
-        cache = json.load(f)
+    cache = orjson.loads(CACHE_FILE.read_bytes())
 
     # Check if config hash matches
     current_hash = compute_config_hash()
@@ -57,8 +63,21 @@ def load_cache():
 def save_cache(cache):
     """Save Claude scores to cache with config hash."""
     cache["_config_hash"] = compute_config_hash()
-    with open(CACHE_FILE, "w") as f:
-        json.dump(cache, f, indent=2)
+    CACHE_FILE.write_bytes(
+        orjson.dumps(cache, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    )
+
+
+@lru_cache(maxsize=8)
+def _read_keywords(path_str, mtime_ns):
+    """Parse a keywords file, memoized on path and modification time."""
+    keywords = []
+    with open(path_str) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                keywords.append(line.lower())
+    return tuple(keywords)
 
 
 def load_keywords(path=None):
@@ -67,13 +86,7 @@ def load_keywords(path=None):
         path = DATA_DIR / "keywords.txt"
     if not path.exists():
         return []
-    keywords = []
-    with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#"):
-                keywords.append(line.lower())
-    return keywords
+    return list(_read_keywords(str(path), path.stat().st_mtime_ns))
 
 
 def expand_keyword(kw):
@@ -98,28 +111,101 @@ def expand_keyword(kw):
     return variations
 
 
-def count_keyword_matches(text, keyword):
+def _is_word_char(char):
+    """Match the `\\w` character class used by regex word boundaries."""
+    return char.isalnum() or char == "_"
+
+
+def build_keyword_automaton(keywords):
     """
-    Count keyword matches using word boundaries.
+    Build an Aho-Corasick automaton over all keyword variations.
 
-    Returns count of matches for keyword and its variations.
+    Each variation maps to its length and the indices of the keywords that
+    expand to it, so a single scan of a text counts every keyword at once.
     """
-    text_lower = text.lower()
-    total = 0
+    variant_to_keywords = {}
+    for k, kw in enumerate(keywords):
+        for variant in expand_keyword(kw):
+            if not variant:
+                continue
+            variant_to_keywords.setdefault(variant.lower(), []).append(k)
+
+    automaton = ahocorasick.Automaton()
+    for variant, kw_indices in variant_to_keywords.items():
+        automaton.add_word(variant, (len(variant), kw_indices))
+    automaton.make_automaton()
+    return automaton
 
-    for variant in expand_keyword(keyword):
-        # Use word boundaries to avoid partial matches
-        pattern = r'\b' + re.escape(variant) + r'\b'
-        total += len(re.findall(pattern, text_lower, re.IGNORECASE))
 
-    return total
+def count_keyword_matches(automaton, text_lower, n_keywords):
+    """
+    Count keyword matches in lowercased text using word boundaries.
+
+    Returns list of match counts (keyword and its variations) per keyword.
+    """
+    counts = [0] * n_keywords
+    if len(automaton) == 0:
+        return counts
+
+    n = len(text_lower)
+
+    def at_boundary(i):
+        before = i > 0 and _is_word_char(text_lower[i - 1])
+        after = i < n and _is_word_char(text_lower[i])
+        return before != after
+
+    for end, (length, kw_indices) in automaton.iter(text_lower):
+        # Require word boundaries on both sides to avoid partial matches
+        if not (at_boundary(end - length + 1) and at_boundary(end + 1)):
+            continue
+        for k in kw_indices:
+            counts[k] += 1
+
+    return counts
+
+
+def compute_idf(corpus, terms):
+    """
+    Compute smoothed IDF weights of terms over a corpus.
+
+    Documents are reduced to their space-joined word tokens and scanned once
+    with an Aho-Corasick automaton over all terms of up to three words. The
+    weights follow scikit-learn's smoothed `log((1 + n) / (1 + df)) + 1`.
+
+    Returns dict mapping each term found in the corpus to its IDF.
+    """
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        tokens = _TOKEN_RE.findall(term)
+        # Only whole word n-grams can occur in a tokenized document
+        if 1 <= len(tokens) <= 3 and " ".join(tokens) == term:
+            automaton.add_word(term, term)
+    if len(automaton) == 0:
+        return {}
+    automaton.make_automaton()
+
+    doc_freq = {}
+    for doc in corpus:
+        text = " ".join(_TOKEN_RE.findall(doc))
+        found = set()
+        for end, term in automaton.iter(text):
+            start = end - len(term) + 1
+            if ((start == 0 or text[start - 1] == " ")
+                    and (end + 1 == len(text) or text[end + 1] == " ")):
+                found.add(term)
+        for term in found:
+            doc_freq[term] = doc_freq.get(term, 0) + 1
+
+    n_docs = len(corpus)
+    return {term: np.log((1 + n_docs) / (1 + df)) + 1
+            for term, df in doc_freq.items()}
 
 
 def rank_by_similarity(papers, keywords=None, title_weight=3.0):
     """
     Rank papers by TF-IDF weighted keyword matches.
 
-    Uses scikit-learn TfidfVectorizer for proper text processing:
+    Text processing:
     - Word boundary matching (no partial matches)
     - Term frequency (counts occurrences)
     - IDF weighting (rare keywords score higher)
@@ -147,67 +233,70 @@ def rank_by_similarity(papers, keywords=None, title_weight=3.0):
         return [(p, 0.0) for p in papers]
 
     # Build corpus for IDF calculation
-    corpus = [p.title + " " + p.abstract for p in papers]
-
-    # Fit TF-IDF vectorizer on corpus to get IDF weights
-    vectorizer = TfidfVectorizer(
-        lowercase=True,
-        token_pattern=r'\b\w+\b',  # Word boundaries
-        ngram_range=(1, 3),  # Unigrams, bigrams, trigrams for phrases
-        use_idf=True,
-        smooth_idf=True,
-    )
-    vectorizer.fit(corpus)
+    corpus = [p.title_lc + " " + p.abstract_lc for p in papers]
+
+    # Only keyword phrases and their words are ever looked up
+    terms = set()
+    for kw in keywords:
+        kw_lower = kw.lower()
+        terms.add(kw_lower)
+        terms.update(kw_lower.split())
 
-    # Get IDF values (use max IDF for unknown terms)
-    vocab = vectorizer.vocabulary_
-    idf_values = vectorizer.idf_
-    max_idf = max(idf_values) if len(idf_values) > 0 else 1.0
+    # IDF weights of terms present in the corpus. Unknown terms get the IDF
+    # of a term seen in a single document, the rarest possible.
+    idf_values = compute_idf(corpus, terms)
+    max_idf = np.log((1 + len(corpus)) / 2) + 1
 
     def get_idf(term):
         """Get IDF for a term, handling multi-word phrases."""
         term_lower = term.lower()
         # Try exact match first
-        if term_lower in vocab:
-            return idf_values[vocab[term_lower]]
+        if term_lower in idf_values:
+            return idf_values[term_lower]
         # Try individual words and average
         words = term_lower.split()
         if len(words) > 1:
-            idfs = [idf_values[vocab[w]] for w in words if w in vocab]
+            idfs = [idf_values[w] for w in words if w in idf_values]
             if idfs:
                 return sum(idfs) / len(idfs)
         return max_idf  # Rare term gets high weight
 
-    # Score each paper
-    raw_scores = []
-    for paper in papers:
-        title = paper.title
-        abstract = paper.abstract
-
-        score = 0.0
-        for kw in keywords:
-            idf = get_idf(kw)
+    # Resolve IDF once per keyword, then count matches in a single scan
+    keyword_idfs = np.array([get_idf(kw) for kw in keywords])
+    automaton = build_keyword_automaton(keywords)
+    n_keywords = len(keywords)
+
+    title_counts = np.array([
+        count_keyword_matches(automaton, p.title_lc, n_keywords)
+        for p in papers
+    ])
+    abstract_counts = np.array([
+        count_keyword_matches(automaton, p.abstract_lc, n_keywords)
+        for p in papers
+    ])
+
+    # TF-IDF style scoring, (1 + count) * idf for every matched keyword
+    title_tf = np.where(title_counts > 0, 1 + title_counts, 0)
+    abstract_tf = np.where(abstract_counts > 0, 1 + abstract_counts, 0)
+    raw_scores = (title_tf @ (keyword_idfs * title_weight)
+                  + abstract_tf @ keyword_idfs)
 
-            # Count matches in title (with weight) and abstract
-            title_count = count_keyword_matches(title, kw)
-            abstract_count = count_keyword_matches(abstract, kw)
+    # Normalize by max score so best paper ~ 100%
+    max_score = raw_scores.max()
+    if max_score > 0:
+        raw_scores = raw_scores / max_score
+    else:
+        raw_scores = np.zeros(len(papers))
 
-            # TF-IDF style scoring
-            if title_count > 0:
-                score += (1 + title_count) * idf * title_weight
-            if abstract_count > 0:
-                score += (1 + abstract_count) * idf
+    order = np.argsort(-raw_scores, kind="stable")
+    return [(papers[i], float(raw_scores[i])) for i in order]
 
-        raw_scores.append((paper, score))
 
-    # Normalize by max score so best paper ~ 100%
-    max_score = max(s for _, s in raw_scores) if raw_scores else 1
-    ranked = [
-        (p, s / max_score if max_score > 0 else 0) for p, s in raw_scores
-    ]
-
-    ranked.sort(key=lambda x: x[1], reverse=True)
-    return ranked
+@lru_cache(maxsize=8)
+def _read_research_description(path_str, mtime_ns):
+    """Read a research description, memoized on path and modification time."""
+    with open(path_str) as f:
+        return f.read().strip()
 
 
 def load_research_description(path=None):
@@ -216,8 +305,75 @@ def load_research_description(path=None):
         path = DATA_DIR / "research_description.txt"
     if not path.exists():
         return ""
-    with open(path) as f:
-        return f.read().strip()
+    return _read_research_description(str(path), path.stat().st_mtime_ns)
+
+
+def _build_prompt(chunk, research_desc, keywords_text):
+    """Build the Claude scoring prompt for a chunk of papers."""
+    papers_text = ""
+    for i, (paper, _) in enumerate(chunk):
+        papers_text += f"\n[{i+1}] {paper.title}\n{paper.abstract[:600]}\n"
+
+    return f"""You are helping a researcher filter daily arXiv papers.
+Rate each paper's relevance from 1-100%, list matching keywords,
+and for papers scoring 75%+, write a one-sentence summary.
+
+RESEARCHER'S FOCUS AREAS:
+{research_desc}
+
+RELEVANT KEYWORDS:
+{keywords_text}
+
+SCORING RUBRIC:
+90-100%: Directly addresses my research, must read
+70-89%: Closely related, relevant methodology
+50-69%: Tangentially related, useful background
+30-49%: Same broad field but different focus
+1-29%: Unrelated to my research
+
+PAPERS:
+{papers_text}
+
+Return ONLY valid JSON. Include "summary" only if score >= 75:
+{{"1": {{"score": 85, "keywords": ["H0"], "summary": "..."}}, "2": ...}}"""
+
+
+async def _score_chunk(client, semaphore, prompt, model):
+    """Send one prompt to Claude and parse the JSON reply, None on failure."""
+    async with semaphore:
+        try:
+            response = await client.messages.create(
+                model=model,
+                max_tokens=1024,
+                messages=[{"role": "user", "content": prompt}]
+            )
+        except anthropic.APIError as e:
+            # Don't lose the other chunks to one failed request
+            print(f"Warning: Claude API request failed: {e}")
+            return None
+
+    # Parse response
+    response_text = response.content[0].text
+    try:
+        # Find JSON object (may be nested)
+        start = response_text.find("{")
+        end = response_text.rfind("}")
+        if start != -1 and end > start:
+            return orjson.loads(response_text[start:end + 1])
+        raise ValueError("No JSON found in response")
+    except (orjson.JSONDecodeError, ValueError) as e:
+        print(f"Warning: Could not parse Claude response: {e}")
+        return None
+
+
+async def _score_all(prompts, model):
+    """Score all prompts concurrently, bounded by CLAUDE_MAX_CONCURRENT."""
+    semaphore = asyncio.Semaphore(CLAUDE_MAX_CONCURRENT)
+    async with anthropic.AsyncAnthropic() as client:
+        return await asyncio.gather(
+            *[_score_chunk(client, semaphore, prompt, model)
+              for prompt in prompts]
+        )
 
 
 def rank_with_claude(papers, top_n=30, model="claude-sonnet-4-20250514"):
@@ -276,6 +432,7 @@ def rank_with_claude(papers, top_n=30, model="claude-sonnet-4-20250514"):
           f"{len(uncached_papers)} new to send to Claude")
 
     # If all cached, skip API call
+    unscored = []
     if not uncached_papers:
         claude_ranked = cached_papers
     else:
@@ -283,79 +440,55 @@ def rank_with_claude(papers, top_n=30, model="claude-sonnet-4-20250514"):
         keywords_text = ", ".join(keywords)
         research_desc = load_research_description()
 
-        # Build prompt for uncached papers only
-        papers_text = ""
-        for i, (paper, _) in enumerate(uncached_papers):
-            papers_text += f"\n[{i+1}] {paper.title}\n{paper.abstract[:600]}\n"
-
-        prompt = f"""You are helping a researcher filter daily arXiv papers.
-Rate each paper's relevance from 1-100%, list matching keywords,
-and for papers scoring 75%+, write a one-sentence summary.
-
-RESEARCHER'S FOCUS AREAS:
-{research_desc}
-
-RELEVANT KEYWORDS:
-{keywords_text}
-
-SCORING RUBRIC:
-90-100%: Directly addresses my research, must read
-70-89%: Closely related, relevant methodology
-50-69%: Tangentially related, useful background
-30-49%: Same broad field but different focus
-1-29%: Unrelated to my research
-
-PAPERS:
-{papers_text}
-
-Return ONLY valid JSON. Include "summary" only if score >= 75:
-{{"1": {{"score": 85, "keywords": ["H0"], "summary": "..."}}, "2": ...}}"""
-
-        # Call Claude API
-        client = anthropic.Anthropic()
-        response = client.messages.create(
-            model=model,
-            max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        # Parse response
-        response_text = response.content[0].text
-        try:
-            # Find JSON object (may be nested)
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                results_dict = json.loads(json_match.group())
-            else:
-                raise ValueError("No JSON found in response")
-        except (json.JSONDecodeError, ValueError) as e:
-            print(f"Warning: Could not parse Claude response: {e}")
-            return keyword_ranked, {}, {}
+        # Split uncached papers into chunks scored by concurrent requests
+        chunks = [
+            uncached_papers[i:i + CLAUDE_CHUNK_SIZE]
+            for i in range(0, len(uncached_papers), CLAUDE_CHUNK_SIZE)
+        ]
+        prompts = [
+            _build_prompt(chunk, research_desc, keywords_text)
+            for chunk in chunks
+        ]
+        chunk_results = asyncio.run(_score_all(prompts, model))
 
         # Apply Claude scores and update cache
         claude_ranked = list(cached_papers)
-        for i, (paper, kw_score) in enumerate(uncached_papers):
-            result = results_dict.get(str(i + 1), {})
-            if isinstance(result, dict):
-                score = result.get("score", 50)
-                kws = result.get("keywords", [])
-                summary = result.get("summary", "")
-            else:
-                score = result
-                kws = []
-                summary = ""
-            cache[paper.arxiv_id] = {
-                "score": score, "keywords": kws, "summary": summary
-            }
-            claude_ranked.append((paper, score / 100.0))
-
-        save_cache(cache)
-        print(f"  Scored {len(uncached_papers)} papers, saved to cache")
+        n_scored = 0
+        for chunk, results_dict in zip(chunks, chunk_results):
+            # Papers in a chunk Claude failed on keep their keyword score
+            # and are ranked below the Claude-scored ones, like `remaining`
+            if results_dict is None:
+                unscored.extend(chunk)
+                continue
+            for i, (paper, kw_score) in enumerate(chunk):
+                result = results_dict.get(str(i + 1), {})
+                if isinstance(result, dict):
+                    score = result.get("score", 50)
+                    kws = result.get("keywords", [])
+                    summary = result.get("summary", "")
+                else:
+                    score = result
+                    kws = []
+                    summary = ""
+                cache[paper.arxiv_id] = {
+                    "score": score, "keywords": kws, "summary": summary
+                }
+                claude_ranked.append((paper, score / 100.0))
+            n_scored += len(chunk)
+
+        if n_scored > 0:
+            save_cache(cache)
+            print(f"  Scored {n_scored} papers, saved to cache")
+
+        # Fall back to keyword ranking if no paper has a Claude score
+        if not claude_ranked:
+            return keyword_ranked, {}, {}
 
     # Sort by Claude score
     claude_ranked.sort(key=lambda x: x[1], reverse=True)
 
-    # Append remaining papers with lower scores
+    # Append unscored and remaining papers with lower scores
+    remaining = unscored + remaining
     if remaining:
         min_claude = min(s for _, s in claude_ranked) if claude_ranked else 0
         remaining_scaled = [(p, s * min_claude * 0.9) for p, s in remaining]
@@ -21,7 +21,8 @@ from pathlib import Path
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from catcharxiv import (
-    fetch_recent_papers, fetch_new_papers, rank_by_similarity, rank_with_claude
+    fetch_recent_papers, fetch_new_papers, mark_seen, rank_by_similarity,
+    rank_with_claude,
 )
 
 
@@ -37,6 +38,12 @@ def load_env():
                     os.environ[key.strip()] = value.strip()
 
 
+def sort_by_score(papers, scores):
+    """Sort papers by score (highest first), unscored papers count as 0."""
+    return sorted(papers, key=lambda p: scores.get(p.arxiv_id, 0),
+                  reverse=True)
+
+
 def main():
     load_env()
     parser = argparse.ArgumentParser(description="Fetch recent arXiv papers")
@@ -51,6 +58,8 @@ def main():
                         help="Claude model to use (default: haiku)")
     parser.add_argument("--top-n", type=int, default=100,
                         help="Number of top papers to send to Claude")
+    parser.add_argument("--unseen", action="store_true",
+                        help="Skip papers shown by earlier --unseen runs")
     parser.add_argument("--clear-cache", action="store_true",
                         help="Clear Claude score cache")
     args = parser.parse_args()
@@ -80,28 +89,33 @@ def main():
 
     if use_new:
         print("Fetching today's arXiv announcement via RSS...")
-        papers = fetch_new_papers(categories=categories)
+        papers = fetch_new_papers(categories=categories,
+                                  skip_seen=args.unseen)
         fetch_days = 1  # For template display
         print(f"Found {len(papers)} papers")
     else:
         fetch_days = args.days
         print(f"Fetching papers from the last {fetch_days} day(s) via API...")
-        papers = fetch_recent_papers(categories=categories, days=fetch_days)
+        papers = fetch_recent_papers(categories=categories, days=fetch_days,
+                                     skip_seen=args.unseen)
         print(f"Found {len(papers)} papers")
 
     templates_dir = Path(__file__).parent.parent / "catcharxiv" / "templates"
     env = Environment(
         loader=FileSystemLoader(templates_dir),
         autoescape=select_autoescape(["html"]),
+        trim_blocks=True,
+        lstrip_blocks=True,
     )
 
-    # Group papers by primary matching category
+    # Group papers by primary matching category, i.e. the first of
+    # `categories` the paper is listed in
     papers_by_cat = {cat: [] for cat in categories}
+    cat_order = {cat: i for i, cat in enumerate(categories)}
     for paper in papers:
-        for cat in categories:
-            if cat in paper.categories:
-                papers_by_cat[cat].append(paper)
-                break
+        matches = [cat for cat in paper.categories if cat in cat_order]
+        if matches:
+            papers_by_cat[min(matches, key=cat_order.get)].append(paper)
 
     # Get date for title
     if papers:
@@ -117,12 +131,10 @@ def main():
         scores = {p.arxiv_id: s for p, s in ranked}
 
         for cat in categories:
-            papers_by_cat[cat].sort(
-                key=lambda p: scores.get(p.arxiv_id, 0), reverse=True
-            )
+            papers_by_cat[cat] = sort_by_score(papers_by_cat[cat], scores)
 
         template = env.get_template("ranked.html")
-        html = template.render(
+        context = dict(
             papers=papers,
             papers_by_cat=papers_by_cat,
             categories=categories,
@@ -139,12 +151,10 @@ def main():
         scores = {p.arxiv_id: s for p, s in ranked}
 
         for cat in categories:
-            papers_by_cat[cat].sort(
-                key=lambda p: scores.get(p.arxiv_id, 0), reverse=True
-            )
+            papers_by_cat[cat] = sort_by_score(papers_by_cat[cat], scores)
 
         template = env.get_template("ranked.html")
-        html = template.render(
+        context = dict(
             papers=papers,
             papers_by_cat=papers_by_cat,
             categories=categories,
@@ -155,7 +165,7 @@ def main():
         )
     else:
         template = env.get_template("index.html")
-        html = template.render(
+        context = dict(
             papers=papers,
             papers_by_cat=papers_by_cat,
             categories=categories,
@@ -178,7 +188,11 @@ def main():
     filename = f"catcharxiv_{date_str}_{method}.html"
     output_dir = Path(os.environ["CATCHARXIV_OUTPUT_DIR"]).expanduser()
     output_file = output_dir / filename
-    output_file.write_text(html)
+    # Stream the rendered HTML to disk instead of building it in memory
+    template.stream(**context).dump(str(output_file), encoding="utf-8")
+    # Only remember papers once they have been written out
+    if args.unseen:
+        mark_seen(papers)
     print(f"Saved to {output_file}")
     webbrowser.open(f"file://{output_file}")
 
@@ -24,9 +24,14 @@ setup(
     packages=find_packages(exclude=["venv_arxiv"]),
     python_requires=">=3.10",
     install_requires=[
+        "aiohttp",
         "arxiv",
+        "feedparser",
         "anthropic",
         "jinja2",
-        "scikit-learn",
+        "numpy",
+        "orjson",
+        "pyahocorasick",
+        "requests",
     ],
 )